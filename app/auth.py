@@ -1,16 +1,14 @@
-import os
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from .utils import ok, bad
 from .cognito_client import get_cognito_client
+from . import aws
+from .config import settings
 
 security = HTTPBearer()
 router = APIRouter(prefix="/auth", tags=["Auth"])
-COGNITO_CONFIGURED = (
-    os.getenv('AWS_COGNITO_USER_POOL_ID') is not None and
-    os.getenv('AWS_COGNITO_CLIENT_ID') is not None
-)
+COGNITO_CONFIGURED = settings.cognito_configured
 
 
 
@@ -49,8 +47,36 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
             headers={"WWW-Authenticate": "Bearer"}
         )
 
+_sns_client = None
+def get_sns_client():
+    global _sns_client
+    if not _sns_client:
+        _sns_client = aws.client('sns', settings.sns_region)
+    return _sns_client
+
+_topic_arn = None
+def get_topic_arn() -> str:
+    global _topic_arn
+    if not _topic_arn:
+        # create_topic is idempotent and returns the existing topic's ARN
+        _topic_arn = get_sns_client().create_topic(Name=settings.sns_topic_name)['TopicArn']
+    return _topic_arn
+
+def subscribe_to_notifications(email: str):
+    try:
+        sns_client = get_sns_client()
+        topic_arn = get_topic_arn()
+        
+        sns_client.subscribe(
+            TopicArn=topic_arn,
+            Protocol='email',
+            Endpoint=email
+        )
+    except Exception as sns_error:
+        print(f"SNS subscription failed for {email}: {sns_error}")
+
 @router.post("/signup")
-def signup(body: SignupBody):
+def signup(body: SignupBody, background_tasks: BackgroundTasks):
     if not COGNITO_CONFIGURED:
         return bad(503, "SERVICE_UNAVAILABLE", "Authentication service not configured")
     
@@ -64,28 +90,7 @@ def signup(body: SignupBody):
         )
         
         if result['success']:
-            try:
-                import boto3
-                import os
-                sns_client = boto3.client(
-                    'sns',
-                    aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                    aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                    region_name=os.getenv('AWS_SNS_REGION', 'us-east-1')
-                )
-                
-                topic_name = os.getenv('AWS_SNS_TOPIC_NAME', 'product-notifications')
-                topic_response = sns_client.create_topic(Name=topic_name)
-                topic_arn = topic_response['TopicArn']
-                
-                sns_client.subscribe(
-                    TopicArn=topic_arn,
-                    Protocol='email',
-                    Endpoint=body.email
-                )
-                
-            except Exception as sns_error:
-                pass
+            background_tasks.add_task(subscribe_to_notifications, body.email)
             
             return ok(result['message'], {
                 "token": result.get('token'),
@@ -0,0 +1,30 @@
+import boto3
+from botocore.config import Config
+from .config import settings
+
+# Threads that can hold a client connection at the same time: the AnyIO
+# threadpool running sync routes, plus the DynamoDB parallel-scan workers
+THREADPOOL_SIZE = 100
+SCAN_WORKERS = 16
+
+BOTO_CONFIG = Config(
+    tcp_keepalive=True,
+    max_pool_connections=THREADPOOL_SIZE + SCAN_WORKERS,
+    retries={'mode': 'adaptive', 'max_attempts': 3}
+)
+
+_session = None
+def get_session():
+    global _session
+    if not _session:
+        _session = boto3.session.Session(
+            aws_access_key_id=settings.aws_access_key_id,
+            aws_secret_access_key=settings.aws_secret_access_key
+        )
+    return _session
+
+def client(service_name: str, region_name: str):
+    return get_session().client(service_name, region_name=region_name, config=BOTO_CONFIG)
+
+def resource(service_name: str, region_name: str):
+    return get_session().resource(service_name, region_name=region_name, config=BOTO_CONFIG)
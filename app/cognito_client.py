@@ -1,32 +1,93 @@
-import boto3
-import os
+import base64
+import hashlib
+import threading
+import time
 import jwt
 import requests
 from typing import Dict, Any
-from dotenv import load_dotenv
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey, RSAPublicNumbers
+from . import aws
+from .cache import TTLCache
+from .config import settings
 
-load_dotenv()
+TOKEN_CACHE_SIZE = 10000
+TOKEN_CACHE_TTL = 300
+TOKEN_EXPIRY_LEEWAY = 60
+JWKS_MIN_REFRESH_INTERVAL = 300
+JWKS_REFRESH_INTERVAL = 3600
+JWKS_FETCH_TIMEOUT = 5
 
 class CognitoClient:
     def __init__(self):
-        self.region = os.getenv('AWS_COGNITO_REGION', 'us-east-1')
-        self.user_pool_id = os.getenv('AWS_COGNITO_USER_POOL_ID')
-        self.client_id = os.getenv('AWS_COGNITO_CLIENT_ID')
+        self.region = settings.cognito_region
+        self.user_pool_id = settings.cognito_user_pool_id
+        self.client_id = settings.cognito_client_id
         
-        self.cognito = boto3.client(
-            'cognito-idp',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=self.region
-        )
+        self.cognito = aws.client('cognito-idp', self.region)
+        self._http = requests.Session()
+        self._jwks_lock = threading.Lock()
         self._jwks = None
+        self._jwks_fetched_at = 0.0
+        self._signing_keys = None
+        self._token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL)
+    
+    def warm_up(self):
+        # JWKS is what token verification needs; load it before touching the user pool
+        self.get_jwks()
+        try:
+            self.cognito.describe_user_pool(UserPoolId=self.user_pool_id)
+        except Exception as e:
+            print(f"Cognito connection warm-up failed: {e}")
         
     def get_jwks(self):
         if self._jwks is None:
-            jwks_url = f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}/.well-known/jwks.json"
-            self._jwks = requests.get(jwks_url).json()
+            with self._jwks_lock:
+                if self._jwks is None:
+                    self._fetch_jwks()
         return self._jwks
     
+    def refresh_jwks(self):
+        with self._jwks_lock:
+            self._fetch_jwks()
+    
+    def _fetch_jwks(self):
+        jwks_url = f"https://cognito-idp.{self.region}.amazonaws.com/{self.user_pool_id}/.well-known/jwks.json"
+        response = self._http.get(jwks_url, timeout=JWKS_FETCH_TIMEOUT)
+        response.raise_for_status()
+        jwks = response.json()
+        
+        self._signing_keys = {key['kid']: self._load_public_key(key) for key in jwks['keys']}
+        self._jwks = jwks
+        self._jwks_fetched_at = time.monotonic()
+    
+    def get_signing_keys(self) -> Dict[str, RSAPublicKey]:
+        if self._signing_keys is None:
+            with self._jwks_lock:
+                if self._signing_keys is None:
+                    self._fetch_jwks()
+        return self._signing_keys
+    
+    def _get_signing_key(self, kid: str):
+        key = self.get_signing_keys().get(kid)
+        if key is None:
+            with self._jwks_lock:
+                # Another thread may have refreshed while we waited for the lock
+                key = self._signing_keys.get(kid)
+                if key is None and time.monotonic() - self._jwks_fetched_at > JWKS_MIN_REFRESH_INTERVAL:
+                    # Unknown kid: the pool may have rotated its keys
+                    self._fetch_jwks()
+                    key = self._signing_keys.get(kid)
+        return key
+    
+    def _load_public_key(self, jwk: Dict[str, str]) -> RSAPublicKey:
+        n = base64.urlsafe_b64decode(jwk['n'] + '==')
+        e = base64.urlsafe_b64decode(jwk['e'] + '==')
+        n_int = int.from_bytes(n, 'big')
+        e_int = int.from_bytes(e, 'big')
+        
+        return RSAPublicNumbers(e_int, n_int).public_key(default_backend())
+    
     def sign_up(self, email: str, password: str, name: str, role: str = "USER") -> Dict[str, Any]:
         try:
             response = self.cognito.sign_up(
@@ -51,22 +112,31 @@ class CognitoClient:
                     AuthFlow='USER_PASSWORD_AUTH',
                     AuthParameters={'USERNAME': email, 'PASSWORD': password}
                 )
-            except:
-                # If email fails, try to find username by listing users
+            except (self.cognito.exceptions.UserNotFoundException,
+                    self.cognito.exceptions.NotAuthorizedException) as auth_error:
+                # Only legacy accounts with a non-email username need the lookup.
+                # With PreventUserExistenceErrors enabled an unknown username is
+                # reported as NotAuthorizedException, so both errors can mean that.
+                if '@' not in email:
+                    raise
+                
                 users_response = self.cognito.list_users(
                     UserPoolId=self.user_pool_id,
                     Filter=f'email = "{email}"',
+                    AttributesToGet=['email'],
                     Limit=1
                 )
-                if users_response['Users']:
-                    username = users_response['Users'][0]['Username']
+                users = users_response['Users']
+                if users and users[0]['Username'] != email:
                     response = self.cognito.initiate_auth(
                         ClientId=self.client_id,
                         AuthFlow='USER_PASSWORD_AUTH',
-                        AuthParameters={'USERNAME': username, 'PASSWORD': password}
+                        AuthParameters={'USERNAME': users[0]['Username'], 'PASSWORD': password}
                     )
-                else:
+                elif isinstance(auth_error, self.cognito.exceptions.UserNotFoundException):
                     raise Exception("User not found")
+                else:
+                    raise
             
             return {
                 'success': True,
@@ -81,32 +151,22 @@ class CognitoClient:
             return {'success': False, 'message': str(e), 'error': str(e)}
     
     def verify_token(self, token: str) -> Dict[str, Any]:
+        cache_key = hashlib.sha256(token.encode()).digest()
+        claims = self._token_cache.get(cache_key)
+        if claims is not None:
+            return {'valid': True, 'user': claims}
+        
+        result = self._verify_token(token)
+        if result['valid']:
+            ttl = min(result['user'].get('exp', 0) - TOKEN_EXPIRY_LEEWAY - time.time(), TOKEN_CACHE_TTL)
+            if ttl > 0:
+                self._token_cache.set(cache_key, result['user'], ttl=ttl)
+        return result
+    
+    def _verify_token(self, token: str) -> Dict[str, Any]:
         try:
-            import json
-            from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
-            from cryptography.hazmat.backends import default_backend
-            from cryptography.hazmat.primitives import serialization
-            import base64
-            
-            jwks = self.get_jwks()
             unverified_header = jwt.get_unverified_header(token)
-            rsa_key = None
-            
-            for key in jwks['keys']:
-                if key['kid'] == unverified_header['kid']:
-                    # Convert JWK to PEM format
-                    n = base64.urlsafe_b64decode(key['n'] + '==')
-                    e = base64.urlsafe_b64decode(key['e'] + '==')
-                    n_int = int.from_bytes(n, 'big')
-                    e_int = int.from_bytes(e, 'big')
-                    
-                    public_numbers = RSAPublicNumbers(e_int, n_int)
-                    public_key = public_numbers.public_key(default_backend())
-                    rsa_key = public_key.public_bytes(
-                        encoding=serialization.Encoding.PEM,
-                        format=serialization.PublicFormat.SubjectPublicKeyInfo
-                    )
-                    break
+            rsa_key = self._get_signing_key(unverified_header['kid'])
             
             if not rsa_key:
                 return {'valid': False, 'message': 'Public key not found'}
@@ -0,0 +1,56 @@
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from dotenv import load_dotenv
+
+ROOT_ENV = Path(__file__).resolve().parents[1] / ".env"
+load_dotenv(dotenv_path=ROOT_ENV, override=True)
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    aws_access_key_id: Optional[str]
+    aws_secret_access_key: Optional[str]
+    aws_region: str
+    dynamodb_table_name: str
+    cognito_region: str
+    cognito_user_pool_id: Optional[str]
+    cognito_client_id: Optional[str]
+    sns_region: str
+    sns_topic_name: str
+    sns_topic_arn: Optional[str]
+    s3_region: str
+    s3_bucket_name: Optional[str]
+    sqs_region: str
+    sqs_queue_name: str
+    sqs_dlq_name: str
+    sqs_notifications_enabled: bool
+
+    @property
+    def cognito_configured(self) -> bool:
+        return self.cognito_user_pool_id is not None and self.cognito_client_id is not None
+
+
+def _load_settings() -> Settings:
+    return Settings(
+        aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
+        aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+        aws_region=os.getenv('AWS_REGION', 'us-east-1'),
+        dynamodb_table_name=os.getenv('AWS_DYNAMODB_TABLE_NAME', 'inventory_products'),
+        cognito_region=os.getenv('AWS_COGNITO_REGION', 'us-east-1'),
+        cognito_user_pool_id=os.getenv('AWS_COGNITO_USER_POOL_ID'),
+        cognito_client_id=os.getenv('AWS_COGNITO_CLIENT_ID'),
+        sns_region=os.getenv('AWS_SNS_REGION', 'us-east-1'),
+        sns_topic_name=os.getenv('AWS_SNS_TOPIC_NAME', 'product-notifications'),
+        sns_topic_arn=os.getenv('AWS_SNS_TOPIC_ARN'),
+        s3_region=os.getenv('AWS_S3_REGION', 'us-east-1'),
+        s3_bucket_name=os.getenv('AWS_S3_BUCKET_NAME'),
+        sqs_region=os.getenv('AWS_SQS_REGION', 'us-east-1'),
+        sqs_queue_name=os.getenv('AWS_SQS_QUEUE_NAME', 'notification-processing-queue'),
+        sqs_dlq_name=os.getenv('AWS_SQS_DLQ_NAME', 'notification-dead-letter-queue'),
+        sqs_notifications_enabled=os.getenv('SQS_ENABLE_NOTIFICATIONS', 'true').lower() == 'true'
+    )
+
+
+settings = _load_settings()
@@ -1,79 +1,225 @@
-import boto3
+import threading
+import time
 import uuid
-import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple
 from decimal import Decimal
-from dotenv import load_dotenv
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from botocore.exceptions import ClientError
+from . import aws
+from .cache import TTLCache
+from .config import settings
 
-load_dotenv()
+SCAN_SEGMENTS = 4
+PRODUCT_CACHE_SIZE = 1024
+PRODUCT_CACHE_TTL = 5
+PAGE_CACHE_SIZE = 64
+BATCH_GET_SIZE = 100
+BATCH_GET_ATTEMPTS = 5
+BATCH_GET_BACKOFF = 0.05
+BATCH_GET_MAX_BACKOFF = 1.0
+
+@lru_cache(maxsize=64)
+def _compile_update(keys: FrozenSet[str]) -> Tuple[str, Dict[str, str]]:
+    ordered = sorted(keys)
+    update_expr = "SET " + ", ".join(f"#{k} = :{k}" for k in ordered)
+    expr_attr_names = {f"#{k}": k for k in ordered}
+    return update_expr, expr_attr_names
+
+class _ScanBudget:
+    """Item count shared by the segments of one parallel scan"""
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.total = 0
+        self._lock = threading.Lock()
+    
+    def add(self, count: int) -> bool:
+        """Record a page of results and report whether the limit has been reached"""
+        with self._lock:
+            self.total += count
+            return self.total >= self.limit
+
+class NativeNumberDeserializer(TypeDeserializer):
+    def _deserialize_n(self, value):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
 
 class DynamoDBClient:
     def __init__(self):
-        self.dynamodb = boto3.resource(
-            'dynamodb',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_REGION', 'us-east-1')
-        )
-        table_name = os.getenv('AWS_DYNAMODB_TABLE_NAME', 'inventory_products')
-        self.inventory_products = self.dynamodb.Table(table_name)
+        self.dynamodb = aws.resource('dynamodb', settings.aws_region)
+        self.table_name = settings.dynamodb_table_name
+        self.inventory_products = self.dynamodb.Table(self.table_name)
+        # The resource's meta.client carries boto3's high-level (de)serialization hooks;
+        # wire-format calls need a plain client
+        self.dynamodb_client = aws.client('dynamodb', settings.aws_region)
+        self._serializer = TypeSerializer()
+        self._deserializer = NativeNumberDeserializer()
+        self._scan_executor = ThreadPoolExecutor(max_workers=aws.SCAN_WORKERS)
+        self._product_cache = TTLCache(maxsize=PRODUCT_CACHE_SIZE, ttl=PRODUCT_CACHE_TTL)
+        self._page_cache = TTLCache(maxsize=PAGE_CACHE_SIZE, ttl=PRODUCT_CACHE_TTL)
+    
+    def warm_up(self):
+        # One request per scan segment so the parallel scan finds warm connections
+        list(self._scan_executor.map(
+            lambda _: self.dynamodb_client.describe_table(TableName=self.table_name),
+            range(SCAN_SEGMENTS)
+        ))
     
-    def _convert_decimals(self, obj):
-        if isinstance(obj, list):
-            return [self._convert_decimals(item) for item in obj]
-        elif isinstance(obj, dict):
-            return {key: self._convert_decimals(value) for key, value in obj.items()}
-        elif isinstance(obj, Decimal):
-            return int(obj) if obj % 1 == 0 else float(obj)
-        return obj
+    def _deserialize_item(self, item: Dict) -> Dict:
+        return {key: self._deserializer.deserialize(value) for key, value in item.items()}
     
     def _prepare_item(self, item: Dict) -> Dict:
-        for key, value in item.items():
-            if isinstance(value, float):
-                item[key] = Decimal(str(value))
-        return item
+        return {key: Decimal(str(value)) if isinstance(value, float) else value for key, value in item.items()}
     
-    def create_product(self, product_data: Dict) -> Dict:
-        product_id = str(uuid.uuid4())
-        timestamp = datetime.now().isoformat()
-        
-        item = {
-            'id': product_id,
+    def _new_product_item(self, product_data: Dict, timestamp: str) -> Dict:
+        return {
+            'id': str(uuid.uuid4()),
             'created_at': timestamp,
             'updated_at': timestamp,
             **product_data
         }
+    
+    def create_product(self, product_data: Dict) -> Dict:
+        item = self._new_product_item(product_data, datetime.now().isoformat())
         
         self.inventory_products.put_item(Item=self._prepare_item(item))
-        return self._convert_decimals(item)
+        self._page_cache.clear()
+        return item
+    
+    def bulk_create_products(self, products_data: List[Dict]) -> List[Dict]:
+        timestamp = datetime.now().isoformat()
+        items = [self._new_product_item(product_data, timestamp) for product_data in products_data]
+        
+        with self.inventory_products.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=self._prepare_item(item))
+        self._page_cache.clear()
+        return items
     
     def get_product_by_id(self, product_id: str) -> Optional[Dict]:
-        response = self.inventory_products.get_item(Key={'id': product_id})
-        return self._convert_decimals(response.get('Item')) if 'Item' in response else None
+        cached = self._product_cache.get(product_id)
+        if cached is not None:
+            return cached
+        
+        response = self.dynamodb_client.get_item(
+            TableName=self.table_name,
+            Key={'id': {'S': product_id}}
+        )
+        if 'Item' not in response:
+            return None
+        
+        product = self._deserialize_item(response['Item'])
+        self._product_cache.set(product_id, product)
+        return product
+    
+    def get_products_by_ids(self, product_ids: List[str]) -> Dict[str, Dict]:
+        unique_ids = list(dict.fromkeys(product_ids))
+        products = {}
+        
+        for start in range(0, len(unique_ids), BATCH_GET_SIZE):
+            request_items = {
+                self.table_name: {'Keys': [{'id': {'S': product_id}} for product_id in unique_ids[start:start + BATCH_GET_SIZE]]}
+            }
+            for attempt in range(BATCH_GET_ATTEMPTS):
+                if attempt:
+                    # Unprocessed keys usually mean throttling, so back off before retrying
+                    time.sleep(min(BATCH_GET_BACKOFF * 2 ** (attempt - 1), BATCH_GET_MAX_BACKOFF))
+                
+                response = self.dynamodb_client.batch_get_item(RequestItems=request_items)
+                for item in response.get('Responses', {}).get(self.table_name, []):
+                    product = self._deserialize_item(item)
+                    products[product['id']] = product
+                
+                request_items = response.get('UnprocessedKeys')
+                if not request_items:
+                    break
+            else:
+                raise Exception(f"Failed to fetch all products after {BATCH_GET_ATTEMPTS} attempts")
+        
+        return products
     
     def get_all_products(self, limit: int = 100) -> List[Dict]:
-        response = self.inventory_products.scan(Limit=limit)
-        return self._convert_decimals(response.get('Items', []))
+        page_size = -(-limit // SCAN_SEGMENTS)
+        budget = _ScanBudget(limit)
+        segments = self._scan_executor.map(
+            lambda segment: self._scan_segment(segment, page_size, budget),
+            range(SCAN_SEGMENTS)
+        )
+        return [item for items in segments for item in items][:limit]
+    
+    def _scan_segment(self, segment: int, page_size: int, budget: _ScanBudget) -> List[Dict]:
+        scan_kwargs = {
+            'TableName': self.table_name,
+            'Segment': segment,
+            'TotalSegments': SCAN_SEGMENTS,
+            'Limit': page_size
+        }
+        items = []
+        
+        # Segments are rarely even, so keep paging until this segment is
+        # exhausted or all segments together have returned enough items
+        while True:
+            response = self.dynamodb_client.scan(**scan_kwargs)
+            page = response.get('Items', [])
+            items.extend(self._deserialize_item(item) for item in page)
+            
+            last_key = response.get('LastEvaluatedKey')
+            if budget.add(len(page)) or not last_key:
+                return items
+            scan_kwargs['ExclusiveStartKey'] = last_key
+    
+    def get_products_page(self, limit: int = 100, start_key: Optional[str] = None) -> Dict:
+        cache_key = (limit, start_key)
+        cached = self._page_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        scan_kwargs = {'TableName': self.table_name, 'Limit': limit}
+        if start_key:
+            scan_kwargs['ExclusiveStartKey'] = {'id': {'S': start_key}}
+        
+        response = self.dynamodb_client.scan(**scan_kwargs)
+        last_key = response.get('LastEvaluatedKey')
+        page = {
+            'items': [self._deserialize_item(item) for item in response.get('Items', [])],
+            'next': last_key['id']['S'] if last_key else None
+        }
+        self._page_cache.set(cache_key, page)
+        return page
     
     def update_product(self, product_id: str, updates: Dict) -> Optional[Dict]:
         updates['updated_at'] = datetime.now().isoformat()
         
-        update_expr = "SET " + ", ".join([f"#{k} = :{k}" for k in updates.keys()])
-        expr_attr_names = {f"#{k}": k for k in updates.keys()}
-        expr_attr_values = {f":{k}": v for k, v in self._prepare_item(updates).items()}
+        update_expr, expr_attr_names = _compile_update(frozenset(updates))
+        expr_attr_values = {f":{k}": self._serializer.serialize(v) for k, v in self._prepare_item(updates).items()}
         
-        response = self.inventory_products.update_item(
-            Key={'id': product_id},
-            UpdateExpression=update_expr,
-            ExpressionAttributeNames=expr_attr_names,
-            ExpressionAttributeValues=expr_attr_values,
-            ReturnValues='ALL_NEW'
-        )
-        return self._convert_decimals(response.get('Attributes'))
+        try:
+            response = self.dynamodb_client.update_item(
+                TableName=self.table_name,
+                Key={'id': {'S': product_id}},
+                UpdateExpression=update_expr,
+                ConditionExpression='attribute_exists(id)',
+                ExpressionAttributeNames=expr_attr_names,
+                ExpressionAttributeValues=expr_attr_values,
+                ReturnValues='ALL_NEW'
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                return None
+            raise e
+        product = self._deserialize_item(response['Attributes'])
+        self._product_cache.set(product_id, product)
+        self._page_cache.clear()
+        return product
     
     def delete_product(self, product_id: str) -> bool:
         self.inventory_products.delete_item(Key={'id': product_id})
+        self._product_cache.pop(product_id)
+        self._page_cache.clear()
         return True
 
 _client = None
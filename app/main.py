@@ -1,15 +1,23 @@
-from pathlib import Path
+import asyncio
+import anyio
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
 from . import auth, products, s3_routes
+from .aws import THREADPOOL_SIZE
 
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[1] / ".env", override=True)
+WARM_UP_TIMEOUT = 10
+
+def _operation_id(route: APIRoute) -> str:
+    return f"{route.tags[0]}_{route.name}".lower() if route.tags else route.name
 
 app = FastAPI(
     title="Inventory API",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
+    generate_unique_id_function=_operation_id
 )
 
 app.add_middleware(
@@ -24,11 +32,52 @@ app.include_router(auth.router, prefix="/api")
 app.include_router(products.router, prefix="/api")
 app.include_router(s3_routes.router, prefix="/api")
 
+def _warm_up_clients():
+    try:
+        from .dynamodb_client import get_db_client
+        get_db_client().warm_up()
+    except Exception as e:
+        print(f"DynamoDB warm-up failed: {e}")
+    
+    try:
+        from .notifications import get_notification_service
+        get_notification_service()
+    except Exception as e:
+        print(f"Notification service warm-up failed: {e}")
+    
+    if auth.COGNITO_CONFIGURED:
+        try:
+            from .cognito_client import get_cognito_client
+            get_cognito_client().warm_up()
+        except Exception as e:
+            print(f"Cognito warm-up failed: {e}")
+
+async def _refresh_jwks_periodically():
+    from .cognito_client import get_cognito_client, JWKS_REFRESH_INTERVAL
+    while True:
+        await asyncio.sleep(JWKS_REFRESH_INTERVAL)
+        try:
+            await asyncio.to_thread(get_cognito_client().refresh_jwks)
+        except Exception as e:
+            print(f"JWKS refresh failed: {e}")
+
 @app.on_event("startup")
 async def startup():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    
+    # Warm-up is blocking AWS I/O; keep it off the event loop and never let a
+    # slow or unreachable endpoint hold up startup
+    try:
+        await asyncio.wait_for(asyncio.to_thread(_warm_up_clients), timeout=WARM_UP_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"Client warm-up still running after {WARM_UP_TIMEOUT}s; continuing startup")
+    app.openapi()
+    
+    if auth.COGNITO_CONFIGURED:
+        asyncio.create_task(_refresh_jwks_periodically())
+    
     try:
         from .sqs.worker import start_background_worker
-        import asyncio
         asyncio.create_task(start_background_worker(batch_size=10, polling_interval=5))
         print("Background worker started for SQS/SNS notifications")
     except Exception as e:
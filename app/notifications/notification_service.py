@@ -1,10 +1,14 @@
-import os
-import boto3
-from typing import List, Dict, Any
-from pathlib import Path
-from dotenv import load_dotenv
+import threading
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
 
-load_dotenv(dotenv_path=Path(__file__).resolve().parents[2] / ".env", override=True)
+@lru_cache(maxsize=64)
+def _headings(resource: str, action: str) -> Tuple[str, str]:
+    return f"{resource.title()} {action.title()}", f"{resource.upper()} {action.upper()}"
+
+@lru_cache(maxsize=256)
+def _field_label(key: str) -> str:
+    return key.replace('_', ' ').title()
 
 class NotificationService:
     def __init__(self):
@@ -14,9 +18,10 @@ class NotificationService:
     def notify(self, action: str, resource: str, data: Dict[str, Any], priority="normal"):
         try:
             name = data.get('name', data.get('id', 'Item'))
-            subject = f"{resource.title()} {action.title()}: {name}"
-            details = "\n".join([f"{k.replace('_', ' ').title()}: {v}" for k, v in data.items()])
-            message = f"{resource.upper()} {action.upper()}\n\n{details}"
+            subject_prefix, message_heading = _headings(resource, action)
+            subject = f"{subject_prefix}: {name}"
+            details = "\n".join(f"{_field_label(k)}: {v}" for k, v in data.items())
+            message = f"{message_heading}\n\n{details}"
             
             from ..sqs.interfaces import NotificationPayload
             payload = NotificationPayload(
@@ -33,8 +38,11 @@ class NotificationService:
             return False
 
 _service = None
+_service_lock = threading.Lock()
 def get_notification_service():
     global _service
-    if not _service:
-        _service = NotificationService()
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = NotificationService()
     return _service
\ No newline at end of file
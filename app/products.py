@@ -1,7 +1,6 @@
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends
-from fastapi.encoders import jsonable_encoder
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from pydantic import BaseModel, Field, HttpUrl
 from .utils import ok, bad
 from .auth import get_current_user
@@ -9,12 +8,7 @@ from .dynamodb_client import get_db_client
 from .notifications import get_notification_service
 
 router = APIRouter(prefix="/products", tags=["Products"])
-
-try:
-    db = get_db_client()
-    notification = get_notification_service()
-except Exception as e:
-    raise RuntimeError(f"Failed to initialize services: {e}")
+READ_CACHE_HEADERS = {"Cache-Control": "private, max-age=30"}
 
 class ProductCreate(BaseModel):
     name: str = Field(..., min_length=1, max_length=200, description="Product name")
@@ -39,18 +33,39 @@ class ProductUpdate(BaseModel):
     image_url: Optional[HttpUrl] = Field(None, description="Product image URL")
     is_active: Optional[bool] = Field(None, description="Whether product is active")
 
+def notify_product_change(action: str, data: dict, priority: str = "normal"):
+    try:
+        result = get_notification_service().notify(
+            action=action,
+            resource="product",
+            data=data,
+            priority=priority
+        )
+        
+        if result:
+            print(f"Notification queued to SQS: {data.get('name')}")
+        else:
+            print(f"Notification queueing failed: {data.get('name')}")
+            
+    except Exception as notification_error:
+        print(f"Notification exception: {notification_error}")
+
 @router.get("/")
-def get_all_products(current=Depends(get_current_user)):
+def get_all_products(
+    limit: int = Query(100, ge=1, le=1000),
+    start: Optional[str] = None,
+    current=Depends(get_current_user)
+):
     try:
-        products = db.get_all_products(limit=100)
-        return ok("Products fetched", products)
+        page = get_db_client().get_products_page(limit=limit, start_key=start)
+        return ok("Products fetched", page, headers=READ_CACHE_HEADERS)
     except Exception as e:
         return bad(500, "DATABASE_ERROR", "Failed to fetch products", str(e))
 
 @router.get("/search")
 def search_products(query: str, current=Depends(get_current_user)):
     try:
-        all_products = db.get_all_products(limit=1000)
+        all_products = get_db_client().get_all_products(limit=1000)
         
         if not query:
             return ok("Search results", all_products)
@@ -71,36 +86,18 @@ def search_products(query: str, current=Depends(get_current_user)):
         return bad(500, "DATABASE_ERROR", "Failed to search products", str(e))
 
 @router.post("/", status_code=201)
-def create_product(body: ProductCreate, current=Depends(get_current_user)):
+def create_product(body: ProductCreate, background_tasks: BackgroundTasks, current=Depends(get_current_user)):
     try:
         product_data = body.model_dump(mode="json")
-        product_data = jsonable_encoder(product_data)
         
-        product = db.create_product(product_data)
+        product = get_db_client().create_product(product_data)
         
-        try:
-            notification_data = {
-                **product,
-                "created_by": current.get("email", "Unknown"),
-                "created_by_name": current.get("name", "Unknown User")
-            }
-            
-            result = notification.notify(
-                action="created",
-                resource="product",
-                data=notification_data,
-                priority="normal"
-            )
-            
-            if result:
-                print(f"Notification queued to SQS: {product.get('name')}")
-            else:
-                print(f"Notification queueing failed: {product.get('name')}")
-                
-        except Exception as notification_error:
-            print(f"Notification exception: {notification_error}")
-            import traceback
-            traceback.print_exc()
+        notification_data = {
+            **product,
+            "created_by": current.get("email", "Unknown"),
+            "created_by_name": current.get("name", "Unknown User")
+        }
+        background_tasks.add_task(notify_product_change, "created", notification_data)
         
         return ok("Product created successfully", product, status_code=201)
         
@@ -112,40 +109,28 @@ def create_product(body: ProductCreate, current=Depends(get_current_user)):
 @router.get("/{product_id}")
 def get_product_by_id(product_id: str, current=Depends(get_current_user)):
     try:
-        product = db.get_product_by_id(product_id)
+        product = get_db_client().get_product_by_id(product_id)
         if not product:
             return bad(404, "NOT_FOUND", "Product not found")
         
-        return ok("Product found", product)
+        return ok("Product found", product, headers=READ_CACHE_HEADERS)
         
     except Exception as e:
         return bad(500, "DATABASE_ERROR", "Failed to fetch product", str(e))
 
 @router.put("/{product_id}")
-def update_product_by_id(product_id: str, body: ProductUpdate, current=Depends(get_current_user)):
+def update_product_by_id(product_id: str, body: ProductUpdate, background_tasks: BackgroundTasks, current=Depends(get_current_user)):
     try:
-        existing_product = db.get_product_by_id(product_id)
-        if not existing_product:
-            return bad(404, "NOT_FOUND", "Product not found")
-        
-        update_data = body.model_dump(mode="json", exclude_none=True)
-        update_data = jsonable_encoder(update_data)
+        update_data = body.model_dump(mode="json", exclude_unset=True, exclude_none=True)
         
         if not update_data:
             return bad(400, "NO_DATA", "No update data provided")
         
-        updated_product = db.update_product(product_id, update_data)
+        updated_product = get_db_client().update_product(product_id, update_data)
+        if not updated_product:
+            return bad(404, "NOT_FOUND", "Product not found")
         
-        # Send notification for product update
-        try:
-            notification.notify(
-                action="updated",
-                resource="product",
-                data=updated_product,
-                priority="normal"
-            )
-        except Exception:
-            pass
+        background_tasks.add_task(notify_product_change, "updated", updated_product)
         
         return ok("Product updated successfully", updated_product)
         
@@ -155,28 +140,20 @@ def update_product_by_id(product_id: str, body: ProductUpdate, current=Depends(g
         return bad(500, "DATABASE_ERROR", "Failed to update product", str(e))
 
 @router.delete("/{product_id}")
-def delete_product_by_id(product_id: str, current=Depends(get_current_user)):
+def delete_product_by_id(product_id: str, background_tasks: BackgroundTasks, current=Depends(get_current_user)):
     try:
-        existing_product = db.get_product_by_id(product_id)
+        existing_product = get_db_client().get_product_by_id(product_id)
         if not existing_product:
             return bad(404, "NOT_FOUND", "Product not found")
         
-        try:
-            notification_data = {
-                **existing_product,
-                "deleted_by": current.get("email", "Unknown"),
-                "deleted_by_name": current.get("name", "Unknown User")
-            }
-            notification.notify(
-                action="deleted",
-                resource="product",
-                data=notification_data,
-                priority="high"  # High priority for deletions
-            )
-        except Exception:
-            pass
-        
-        db.delete_product(product_id)
+        get_db_client().delete_product(product_id)
+        
+        notification_data = {
+            **existing_product,
+            "deleted_by": current.get("email", "Unknown"),
+            "deleted_by_name": current.get("name", "Unknown User")
+        }
+        background_tasks.add_task(notify_product_change, "deleted", notification_data, "high")  # High priority for deletions
         return ok("Product deleted successfully", {"deleted_product_id": product_id})
         
     except Exception as e:
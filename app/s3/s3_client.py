@@ -1,42 +1,51 @@
-import os
-import boto3
+from io import BytesIO
 from typing import List, Dict, Optional, BinaryIO
-from pathlib import Path
-from dotenv import load_dotenv
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
+from .. import aws
+from ..config import settings
 
-# Load environment variables
-ROOT_ENV = Path(__file__).resolve().parents[2] / ".env"
-load_dotenv(dotenv_path=ROOT_ENV, override=True)
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=8,
+    use_threads=True
+)
 
 
 class S3Client:    
     def __init__(self):
-        self.aws_access_key_id = os.getenv('AWS_ACCESS_KEY_ID')
-        self.aws_secret_access_key = os.getenv('AWS_SECRET_ACCESS_KEY')
-        self.aws_region = os.getenv('AWS_S3_REGION', 'us-east-1')
-        self.bucket_name = os.getenv('AWS_S3_BUCKET_NAME')
+        self.aws_access_key_id = settings.aws_access_key_id
+        self.aws_secret_access_key = settings.aws_secret_access_key
+        self.aws_region = settings.s3_region
+        self.bucket_name = settings.s3_bucket_name
         
         if not all([self.aws_access_key_id, self.aws_secret_access_key, self.bucket_name]):
             raise ValueError("Missing S3 configuration in environment variables")
         
-        self.s3_client = boto3.client(
-            's3',
-            aws_access_key_id=self.aws_access_key_id,
-            aws_secret_access_key=self.aws_secret_access_key,
-            region_name=self.aws_region
-        )
+        self.s3_client = aws.client('s3', self.aws_region)
         
 
     
     def upload_file(self, file_content: bytes, file_key: str, content_type: str = 'application/octet-stream') -> bool:
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=file_key,
-                Body=file_content,
-                ContentType=content_type
-            )
+            if len(file_content) > MULTIPART_THRESHOLD:
+                # Large files go up as parallel multipart parts
+                self.s3_client.upload_fileobj(
+                    BytesIO(file_content),
+                    self.bucket_name,
+                    file_key,
+                    ExtraArgs={'ContentType': content_type},
+                    Config=TRANSFER_CONFIG
+                )
+            else:
+                self.s3_client.put_object(
+                    Bucket=self.bucket_name,
+                    Key=file_key,
+                    Body=file_content,
+                    ContentType=content_type
+                )
             return True
             
         except ClientError as e:
@@ -55,6 +64,29 @@ class S3Client:
         except Exception as e:
             return None
     
+    def download_range(self, file_key: str, start: int, end: int) -> Optional[Dict]:
+        try:
+            response = self.s3_client.get_object(
+                Bucket=self.bucket_name,
+                Key=file_key,
+                Range=f"bytes={start}-{end}"
+            )
+            content = response['Body'].read()
+            
+            # ContentRange looks like "bytes 0-65535/1048576"; the part after '/' is the object size
+            content_range = response.get('ContentRange')
+            if content_range:
+                total_size = int(content_range.rpartition('/')[2])
+            else:
+                total_size = response.get('ContentLength', len(content))
+            
+            return {'content': content, 'total_size': total_size}
+            
+        except ClientError as e:
+            return None
+        except Exception as e:
+            return None
+    
     def list_files(self, prefix: str = '') -> List[Dict]:
         try:
             response = self.s3_client.list_objects_v2(
@@ -79,6 +111,25 @@ class S3Client:
         except Exception as e:
             return []
     
+    def list_files_page(self, prefix: str = '', max_keys: int = 1000,
+                        continuation_token: Optional[str] = None) -> Dict:
+        list_kwargs = {'Bucket': self.bucket_name, 'Prefix': prefix, 'MaxKeys': max_keys}
+        if continuation_token:
+            list_kwargs['ContinuationToken'] = continuation_token
+        
+        response = self.s3_client.list_objects_v2(**list_kwargs)
+        
+        files = [
+            {
+                'key': obj['Key'],
+                'size': obj['Size'],
+                'last_modified': obj['LastModified'].isoformat(),
+                'etag': obj['ETag'].strip('"')
+            }
+            for obj in response.get('Contents', [])
+        ]
+        return {'files': files, 'next': response.get('NextContinuationToken')}
+    
     def delete_file(self, file_key: str) -> bool:
         try:
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=file_key)
@@ -107,6 +158,20 @@ class S3Client:
             )
             return url
             
+        except ClientError as e:
+            return None
+        except Exception as e:
+            return None
+    
+    def get_upload_url(self, file_key: str, content_type: str, expiration: int = 900) -> Optional[str]:
+        try:
+            url = self.s3_client.generate_presigned_url(
+                'put_object',
+                Params={'Bucket': self.bucket_name, 'Key': file_key, 'ContentType': content_type},
+                ExpiresIn=expiration
+            )
+            return url
+            
         except ClientError as e:
             return None
         except Exception as e:
@@ -2,50 +2,59 @@ import os
 import csv
 import json
 import uuid
+from itertools import islice
 from datetime import datetime
-from typing import List, Dict, Optional, Union
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Union
 from io import StringIO, BytesIO
 from .s3_client import S3Client
 
+PREVIEW_BYTES = 64 * 1024
+
+ALLOWED_FILE_TYPES: Mapping[str, str] = MappingProxyType({
+    'csv': 'text/csv',
+    'json': 'application/json',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    'txt': 'text/plain'
+})
+ALLOWED_EXTENSIONS = frozenset(ALLOWED_FILE_TYPES)
+
 
 class BulkDataService:
     
     def __init__(self):
         self.s3_client = S3Client()
-        self.allowed_file_types = {
-            'csv': 'text/csv',
-            'json': 'application/json',
-            'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            'txt': 'text/plain'
-        }
+        self.allowed_file_types = ALLOWED_FILE_TYPES
         
     
-    def generate_file_key(self, original_filename: str) -> str:
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        unique_id = str(uuid.uuid4())[:8]
+    def generate_file_key(self, original_filename: str, now: Optional[datetime] = None) -> str:
+        timestamp = (now or datetime.now()).strftime('%Y%m%d_%H%M%S')
+        unique_id = uuid.uuid4().hex[:8]
         
         filename = f"{timestamp}_{unique_id}_{original_filename}"
         return filename
     
+    def get_file_extension(self, filename: str) -> str:
+        return filename.rpartition('.')[2].lower()
+    
     def validate_file_type(self, filename: str) -> bool:
-        
-        file_extension = filename.split('.')[-1].lower()
-        return file_extension in self.allowed_file_types
+        return self.get_file_extension(filename) in ALLOWED_EXTENSIONS
     
     def get_content_type(self, filename: str) -> str:
-        file_extension = filename.split('.')[-1].lower()
-        return self.allowed_file_types.get(file_extension, 'application/octet-stream')
+        return self.allowed_file_types.get(self.get_file_extension(filename), 'application/octet-stream')
     
     def upload_bulk_file(self, file_content: bytes, filename: str) -> Optional[Dict]:
         try:
-            if not self.validate_file_type(filename):
+            file_extension = self.get_file_extension(filename)
+            if file_extension not in ALLOWED_EXTENSIONS:
                 return {
                     'success': False,
                     'error': f'File type not allowed. Supported: {", ".join(self.allowed_file_types.keys())}'
                 }
             
-            file_key = self.generate_file_key(filename)
-            content_type = self.get_content_type(filename)
+            now = datetime.now()
+            file_key = self.generate_file_key(filename, now)
+            content_type = self.allowed_file_types[file_extension]
             
             success = self.s3_client.upload_file(file_content, file_key, content_type)
             
@@ -56,7 +65,7 @@ class BulkDataService:
                     'original_filename': filename,
                     'size_bytes': len(file_content),
                     'content_type': content_type,
-                    'uploaded_at': datetime.now().isoformat()
+                    'uploaded_at': now.isoformat()
                 }
             else:
                 return {
@@ -94,31 +103,26 @@ class BulkDataService:
                 'error': f'Download failed: {str(e)}'
             }
     
+    def _enrich_file(self, file_info: Dict) -> Dict:
+        filename = file_info['key']
+        parts = filename.split('_', 3)
+        return {**file_info, 'original_filename': parts[3] if len(parts) == 4 else filename}
+    
     def list_files(self) -> List[Dict]:
         try:
             files = self.s3_client.list_files("")
-            
-            enriched_files = []
-            for file_info in files:
-                enriched_file = file_info.copy()
-                
-                filename = file_info['key']
-                if '_' in filename:
-                    parts = filename.split('_', 3)
-                    if len(parts) == 4:
-                        enriched_file['original_filename'] = parts[3]
-                    else:
-                        enriched_file['original_filename'] = filename
-                else:
-                    enriched_file['original_filename'] = filename
-                    
-                enriched_files.append(enriched_file)
-            
-            return enriched_files
+            return [self._enrich_file(file_info) for file_info in files]
             
         except Exception as e:
             return []
     
+    def list_files_page(self, page_size: int = 100, page_token: Optional[str] = None) -> Dict:
+        page = self.s3_client.list_files_page("", max_keys=page_size, continuation_token=page_token)
+        return {
+            'items': [self._enrich_file(file_info) for file_info in page['files']],
+            'next': page['next']
+        }
+    
     def delete_bulk_file(self, file_key: str) -> Dict:
         try:
             success = self.s3_client.delete_file(file_key)
@@ -145,6 +149,21 @@ class BulkDataService:
        
         return self.s3_client.get_file_url(file_key, expiration)
     
+    def get_upload_url(self, filename: str, expiration: int = 900) -> Optional[Dict]:
+        file_key = self.generate_file_key(filename)
+        content_type = self.get_content_type(filename)
+        
+        url = self.s3_client.get_upload_url(file_key, content_type, expiration)
+        if not url:
+            return None
+        
+        return {
+            'upload_url': url,
+            'file_key': file_key,
+            'content_type': content_type,
+            'expires_in': expiration
+        }
+    
     def preview_csv_content(self, file_key: str, max_rows: int = 10) -> Optional[Dict]:
        
         try:
@@ -154,30 +173,43 @@ class BulkDataService:
                     'error': 'File is not a CSV file'
                 }
             
-            file_content = self.s3_client.download_file(file_key)
-            if not file_content:
+            preview = self.s3_client.download_range(file_key, 0, PREVIEW_BYTES - 1)
+            if not preview or not preview['content']:
                 return {
                     'success': False,
                     'error': 'Failed to download file for preview'
                 }
             
-            csv_text = file_content.decode('utf-8')
+            file_content = preview['content']
+            
+            # Only the first PREVIEW_BYTES are fetched; drop a trailing partial row
+            truncated = preview['total_size'] > len(file_content)
+            if truncated:
+                last_newline = file_content.rfind(b'\n')
+                if last_newline == -1:
+                    return {
+                        'success': False,
+                        'error': f'CSV header row is longer than the {PREVIEW_BYTES // 1024} KiB preview limit'
+                    }
+                file_content = file_content[:last_newline + 1]
+            
+            csv_text = file_content.decode('utf-8', errors='replace')
             csv_reader = csv.reader(StringIO(csv_text))
             
-            rows = list(csv_reader)
-            if not rows:
+            headers = next(csv_reader, None)
+            if not headers:
                 return {
                     'success': False,
                     'error': 'CSV file is empty'
                 }
             
-            headers = rows[0] if rows else []
-            sample_rows = rows[1:max_rows+1] if len(rows) > 1 else []
+            sample_rows = list(islice(csv_reader, max_rows))
             
             return {
                 'success': True,
                 'file_key': file_key,
-                'total_rows': len(rows) - 1,  # Exclude header
+                # Total row count is only known when the whole file fit in the preview range
+                'total_rows': None if truncated else len(sample_rows) + sum(1 for _ in csv_reader),
                 'headers': headers,
                 'sample_rows': sample_rows,
                 'preview_rows': len(sample_rows)
@@ -189,8 +221,5 @@ class BulkDataService:
                 'error': f'Preview failed: {str(e)}'
             }
     
-    def get_supported_file_types(self) -> List[str]:
-        return list(self.allowed_file_types.keys())
-    
     def get_supported_file_types(self) -> List[str]:
         return list(self.allowed_file_types.keys())
\ No newline at end of file
@@ -1,17 +1,25 @@
-from fastapi import APIRouter, File, UploadFile, Depends
+from typing import Optional
+from fastapi import APIRouter, File, UploadFile, Depends, Query
+from fastapi.concurrency import run_in_threadpool
 from .auth import get_current_user
 from .utils import ok, bad
 from .s3.service import BulkDataService
 
 router = APIRouter(prefix="/s3", tags=["S3"])
 
-try:
-    file_service = BulkDataService()
-except:
-    file_service = None
+_file_service = None
+def get_file_service():
+    global _file_service
+    if not _file_service:
+        try:
+            _file_service = BulkDataService()
+        except Exception:
+            return None
+    return _file_service
 
 @router.post("/upload")
 async def upload_file(file: UploadFile = File(...), current=Depends(get_current_user)):
+    file_service = get_file_service()
     if not file_service:
         return bad(503, "SERVICE_UNAVAILABLE", "S3 not configured")
     
@@ -20,7 +28,7 @@ async def upload_file(file: UploadFile = File(...), current=Depends(get_current_
     
     try:
         content = await file.read()
-        result = file_service.upload_bulk_file(content, file.filename)
+        result = await run_in_threadpool(file_service.upload_bulk_file, content, file.filename)
         
         if not result or not result.get('success'):
             return bad(500, "UPLOAD_FAILED", "Upload failed")
@@ -29,19 +37,43 @@ async def upload_file(file: UploadFile = File(...), current=Depends(get_current_
     except Exception as e:
         return bad(500, "UPLOAD_ERROR", str(e))
 
+@router.post("/upload-url")
+async def get_upload_url(filename: str, current=Depends(get_current_user)):
+    file_service = get_file_service()
+    if not file_service:
+        return bad(503, "SERVICE_UNAVAILABLE", "S3 not configured")
+    
+    if not file_service.validate_file_type(filename):
+        return bad(400, "INVALID_FILE", "Invalid file")
+    
+    try:
+        result = file_service.get_upload_url(filename)
+        if not result:
+            return bad(500, "UPLOAD_URL_FAILED", "Could not generate upload URL")
+        
+        return ok("Upload URL generated", result)
+    except Exception as e:
+        return bad(500, "UPLOAD_URL_ERROR", str(e))
+
 @router.get("/files")
-async def list_files(current=Depends(get_current_user)):
+async def list_files(
+    page_size: int = Query(100, ge=1, le=1000),
+    page_token: Optional[str] = None,
+    current=Depends(get_current_user)
+):
+    file_service = get_file_service()
     if not file_service:
         return bad(503, "SERVICE_UNAVAILABLE", "S3 not configured")
     
     try:
-        files = file_service.list_files()
-        return ok(f"Retrieved {len(files)} files", files)
+        page = await run_in_threadpool(file_service.list_files_page, page_size, page_token)
+        return ok(f"Retrieved {len(page['items'])} files", page)
     except Exception as e:
         return bad(500, "LIST_ERROR", str(e))
 
 @router.get("/download/{file_key:path}")
 async def download_file(file_key: str, current=Depends(get_current_user)):
+    file_service = get_file_service()
     if not file_service:
         return bad(503, "SERVICE_UNAVAILABLE", "S3 not configured")
     
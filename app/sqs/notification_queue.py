@@ -1,27 +1,29 @@
 
-import os
 import json
 import uuid
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
-from pathlib import Path
-from dotenv import load_dotenv
+from .. import aws
+from ..config import settings
 from .sqs_client import SQSClient
 from .interfaces import QueueMessage, NotificationPayload
 
-ROOT_ENV = Path(__file__).resolve().parents[2] / ".env"
-load_dotenv(dotenv_path=ROOT_ENV, override=True)
-
 
 class NotificationQueueService:
     
     def __init__(self):
         self.sqs_client = SQSClient()
-        self.enabled = os.getenv('SQS_ENABLE_NOTIFICATIONS', 'true').lower() == 'true'
+        self.enabled = settings.sqs_notifications_enabled
         
         # Queue names from environment variables
-        self.notification_queue = os.getenv('AWS_SQS_QUEUE_NAME', 'notification-processing-queue')
-        self.dlq_queue = os.getenv('AWS_SQS_DLQ_NAME', 'notification-dead-letter-queue')
+        self.notification_queue = settings.sqs_queue_name
+        self.dlq_queue = settings.sqs_dlq_name
+        
+        # SNS clients cache, keyed by region
+        self._sns_clients = {}
+        
+        # Resolved SNS topic ARNs, keyed by topic name
+        self._topic_arns = {}
         
         # Initialize queues if enabled
         if self.enabled:
@@ -50,6 +52,11 @@ class NotificationQueueService:
         except Exception as e:
             pass
     
+    def _get_sns_client(self, region: str):
+        if region not in self._sns_clients:
+            self._sns_clients[region] = aws.client('sns', region)
+        return self._sns_clients[region]
+    
     def _get_queue_arn(self, queue_name: str) -> Optional[str]:
         try:
             return f"arn:aws:sqs:{self.sqs_client.region}:{self.sqs_client.account_id}:{queue_name}"
@@ -64,18 +71,7 @@ class NotificationQueueService:
         
         try:
             # Create queue message
-            message = QueueMessage(
-                id=str(uuid.uuid4()),
-                message_type="email_notification",
-                payload={
-                    "notification": notification.model_dump(),
-                    "priority": priority,
-                    "queued_at": datetime.now().isoformat()
-                },
-                retry_count=0,
-                max_retries=3,
-                created_at=datetime.now()
-            )
+            message = self._build_message(notification, priority)
             
             # Send to SQS
             success = self.sqs_client.send_message(
@@ -90,19 +86,28 @@ class NotificationQueueService:
             # Fallback to direct notification if queuing fails
             return self._send_direct_notification(notification)
     
+    def _build_message(self, notification: NotificationPayload, priority: str) -> QueueMessage:
+        now = datetime.now()
+        return QueueMessage(
+            id=str(uuid.uuid4()),
+            message_type="email_notification",
+            payload={
+                "notification": notification.model_dump(),
+                "priority": priority,
+                "queued_at": now.isoformat()
+            },
+            retry_count=0,
+            max_retries=3,
+            created_at=now
+        )
+    
     def _send_direct_notification(self, notification: NotificationPayload) -> bool:
        
         try:
             # Send email via SNS directly
-            import boto3
-            import os
+            sns_client = self._get_sns_client(settings.aws_region)
             
-            sns_client = boto3.client('sns',
-                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                region_name=os.getenv('AWS_REGION', 'us-east-1'))
-            
-            topic_arn = os.getenv('AWS_SNS_TOPIC_ARN')
+            topic_arn = settings.sns_topic_arn
             
             # Publish to SNS topic
             response = sns_client.publish(
@@ -201,19 +206,11 @@ class NotificationQueueService:
     
     def _send_email_notification(self, notification: NotificationPayload) -> bool:
         try:
-            # Import here to avoid circular imports
-            import boto3
-            
             # Use SNS directly for email delivery
-            sns_client = boto3.client(
-                'sns',
-                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                region_name=os.getenv('AWS_SNS_REGION', 'us-east-1')
-            )
+            sns_client = self._get_sns_client(settings.sns_region)
             
             # Get the notification topic name from environment
-            topic_name = os.getenv('AWS_SNS_TOPIC_NAME', 'product-notifications')
+            topic_name = settings.sns_topic_name
             topic_arn = self._get_sns_topic_arn(topic_name)
             
             if not topic_arn:
@@ -238,21 +235,18 @@ class NotificationQueueService:
             return False
     
     def _get_sns_topic_arn(self, topic_name: str) -> Optional[str]:
+        if topic_name in self._topic_arns:
+            return self._topic_arns[topic_name]
+        
         try:
-            import boto3
-            
-            sns_client = boto3.client(
-                'sns',
-                aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-                region_name=os.getenv('AWS_SNS_REGION', 'us-east-1')
-            )
+            sns_client = self._get_sns_client(settings.sns_region)
             
-            response = sns_client.list_topics()
-            for topic in response.get('Topics', []):
-                arn = topic['TopicArn']
-                if arn.endswith(f":{topic_name}"):
-                    return arn
+            suffix = f":{topic_name}"
+            for page in sns_client.get_paginator('list_topics').paginate():
+                for topic in page.get('Topics', []):
+                    if topic['TopicArn'].endswith(suffix):
+                        self._topic_arns[topic_name] = topic['TopicArn']
+                        return topic['TopicArn']
             
             return None
             
@@ -296,26 +290,22 @@ class NotificationQueueService:
             requeued = 0
             
             for msg_data in dlq_messages:
-                try:
-                    message = msg_data['message']
-                    receipt_handle = msg_data['receipt_handle']
-                    
-                    # Reset retry count and requeue
-                    message.retry_count = 0
-                    message.error_message = "Requeued from DLQ"
-                    
-                    success = self.sqs_client.send_message(
-                        queue_name=self.notification_queue,
-                        message=message
-                    )
-                    
-                    if success:
-                        # Delete from DLQ after successful requeue
-                        self.sqs_client.delete_message(self.dlq_queue, receipt_handle)
-                        requeued += 1
+                message = msg_data['message']
                 
-                except Exception:
-                    continue
+                # Reset retry count and requeue
+                message.retry_count = 0
+                message.error_message = "Requeued from DLQ"
+            
+            sent = self.sqs_client.send_messages_batch(
+                queue_name=self.notification_queue,
+                messages=[msg_data['message'] for msg_data in dlq_messages]
+            )
+            
+            for position in sent:
+                # Delete from DLQ after successful requeue; positions keep
+                # duplicate deliveries of the same message apart
+                self.sqs_client.delete_message(self.dlq_queue, dlq_messages[position]['receipt_handle'])
+                requeued += 1
             
             return {
                 "status": "success",
@@ -1,29 +1,21 @@
-import os
 import json
 import uuid
-import boto3
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from botocore.exceptions import ClientError
-from pathlib import Path
-from dotenv import load_dotenv
+from .. import aws
+from ..config import settings
 from .interfaces import QueueMessage, QueueStats
 
-ROOT_ENV = Path(__file__).resolve().parents[2] / ".env"
-load_dotenv(dotenv_path=ROOT_ENV, override=True)
+SEND_BATCH_SIZE = 10
+SEND_BATCH_BYTES = 256 * 1024
 
 
 class SQSClient:
     
     def __init__(self):
-        self.sqs_client = boto3.client(
-            'sqs',
-            aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-            aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
-            region_name=os.getenv('AWS_SQS_REGION', 'us-east-1')
-        )
-        
-        self.region = os.getenv('AWS_SQS_REGION', 'us-east-1')
+        self.region = settings.sqs_region
+        self.sqs_client = aws.client('sqs', self.region)
         self.account_id = self._get_account_id()
         
         # Queue URLs cache
@@ -32,7 +24,7 @@ class SQSClient:
     def _get_account_id(self) -> str:
         """Get AWS account ID"""
         try:
-            sts = boto3.client('sts')
+            sts = aws.client('sts', self.region)
             return sts.get_caller_identity()['Account']
         except Exception:
             return "unknown"
@@ -97,16 +89,7 @@ class SQSClient:
                 QueueUrl=queue_url,
                 MessageBody=message_body,
                 DelaySeconds=delay_seconds,
-                MessageAttributes={
-                    'message_type': {
-                        'StringValue': message.message_type,
-                        'DataType': 'String'
-                    },
-                    'retry_count': {
-                        'StringValue': str(message.retry_count),
-                        'DataType': 'Number'
-                    }
-                }
+                MessageAttributes=self._message_attributes(message)
             )
             
             return True
@@ -116,6 +99,76 @@ class SQSClient:
         except Exception as e:
             return False
     
+    def send_messages_batch(self, queue_name: str, messages: List[QueueMessage],
+                            delay_seconds: int = 0) -> List[int]:
+        """Send messages with SendMessageBatch, returning the positions of the ones SQS accepted"""
+        queue_url = self._get_queue_url(queue_name)
+        if not queue_url:
+            return []
+        
+        sent = []
+        batch = []
+        batch_bytes = 0
+        for position, message in enumerate(messages):
+            message_body = message.model_dump_json()
+            attributes = self._message_attributes(message)
+            entry_bytes = len(message_body.encode('utf-8')) + self._attributes_size(attributes)
+            
+            # A batch holds at most 10 entries and 256 KB of bodies plus attributes
+            if batch and (len(batch) == SEND_BATCH_SIZE or batch_bytes + entry_bytes > SEND_BATCH_BYTES):
+                sent.extend(self._send_batch(queue_url, batch, delay_seconds))
+                batch = []
+                batch_bytes = 0
+            
+            batch.append((position, message_body, attributes))
+            batch_bytes += entry_bytes
+        
+        if batch:
+            sent.extend(self._send_batch(queue_url, batch, delay_seconds))
+        
+        return sent
+    
+    def _send_batch(self, queue_url: str, batch: List[tuple], delay_seconds: int) -> List[int]:
+        try:
+            response = self.sqs_client.send_message_batch(
+                QueueUrl=queue_url,
+                Entries=[
+                    {
+                        'Id': str(position),
+                        'MessageBody': message_body,
+                        'DelaySeconds': delay_seconds,
+                        'MessageAttributes': attributes
+                    }
+                    for position, message_body, attributes in batch
+                ]
+            )
+            
+            return [int(entry['Id']) for entry in response.get('Successful', [])]
+            
+        except ClientError as e:
+            return []
+        except Exception as e:
+            return []
+    
+    def _attributes_size(self, attributes: Dict[str, Dict[str, str]]) -> int:
+        # SQS counts each attribute's name, data type and value toward the message size
+        return sum(
+            len(name.encode('utf-8')) + len(value['DataType'].encode('utf-8')) + len(value['StringValue'].encode('utf-8'))
+            for name, value in attributes.items()
+        )
+    
+    def _message_attributes(self, message: QueueMessage) -> Dict[str, Dict[str, str]]:
+        return {
+            'message_type': {
+                'StringValue': message.message_type,
+                'DataType': 'String'
+            },
+            'retry_count': {
+                'StringValue': str(message.retry_count),
+                'DataType': 'Number'
+            }
+        }
+    
     def receive_messages(self, queue_name: str, max_messages: int = 1, 
                         wait_time: int = 20) -> List[Dict[str, Any]]:
         try:
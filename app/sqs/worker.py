@@ -5,6 +5,8 @@ from typing import Dict, Any
 from datetime import datetime
 from .notification_queue import NotificationQueueService
 
+BATCH_TIMEOUT = 30
+
 
 class NotificationWorker:
     def __init__(self, batch_size: int = 5, polling_interval: int = 10):
@@ -12,6 +14,8 @@ class NotificationWorker:
         self.batch_size = batch_size
         self.polling_interval = polling_interval
         self.running = False
+        # Batch still running in its thread after a timeout; the next poll waits for it
+        self._pending_batch = None
         self.stats = {
             "start_time": None,
             "total_processed": 0,
@@ -44,13 +48,17 @@ class NotificationWorker:
     
     async def _process_batch(self):
         try:
-            import concurrent.futures
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(
+            if self._pending_batch is None:
+                loop = asyncio.get_running_loop()
+                self._pending_batch = loop.run_in_executor(
+                    None,
                     self.notification_service.process_queued_notifications,
                     self.batch_size
                 )
-                results = future.result(timeout=30)
+            
+            # A timeout cannot stop the thread, so shield the future and keep it;
+            # the next call waits on it instead of starting an overlapping batch
+            results = await asyncio.wait_for(asyncio.shield(self._pending_batch), timeout=BATCH_TIMEOUT)
             
             self.stats["last_batch_time"] = datetime.now()
             self.stats["last_batch_size"] = results.get("processed", 0)
@@ -61,6 +69,9 @@ class NotificationWorker:
             
         except Exception as e:
             self.stats["total_failed"] += 1
+        finally:
+            if self._pending_batch is not None and self._pending_batch.done():
+                self._pending_batch = None
     
     def _signal_handler(self, signum, frame):
         self.running = False
@@ -107,7 +118,8 @@ def get_notification_worker(batch_size: int = 5, polling_interval: int = 10) ->
 
 
 async def start_background_worker(batch_size: int = 5, polling_interval: int = 10):
-    worker = get_notification_worker(batch_size, polling_interval)
+    # Building the worker creates the SQS queues, which is blocking I/O
+    worker = await asyncio.to_thread(get_notification_worker, batch_size, polling_interval)
     await worker.start()
 
 
@@ -1,11 +1,7 @@
-import os
-from fastapi.responses import JSONResponse
-from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse
 
-load_dotenv()
-
-def ok(message: str = "OK", data=None, status_code: int = 200):
-    return JSONResponse({"success": True, "message": message, "data": data}, status_code=status_code)
+def ok(message: str = "OK", data=None, status_code: int = 200, headers=None):
+    return ORJSONResponse({"success": True, "message": message, "data": data}, status_code=status_code, headers=headers)
 
 def bad(status_code: int, code: str, message: str, details=None):
-    return JSONResponse({"success": False, "error": {"code": code, "message": message, "details": details}}, status_code=status_code)
+    return ORJSONResponse({"success": False, "error": {"code": code, "message": message, "details": details}}, status_code=status_code)
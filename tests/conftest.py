@@ -0,0 +1,7 @@
+import os
+
+# Settings are read at import time, so point them at fake credentials first
+os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+os.environ['AWS_REGION'] = 'us-east-1'
+os.environ['AWS_DYNAMODB_TABLE_NAME'] = 'inventory_products_test'
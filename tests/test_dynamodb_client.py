@@ -0,0 +1,132 @@
+import pytest
+from moto import mock_aws
+
+from app import aws
+from app.config import settings
+from app.dynamodb_client import DynamoDBClient
+
+PRODUCT = {
+    'name': 'Widget',
+    'description': 'A widget',
+    'price': 9.99,
+    'category': 'Tools',
+    'sku': 'W-1',
+    'in_stock': 5,
+    'reorder_level': 2,
+    'supplier': 'Acme'
+}
+
+
+@pytest.fixture
+def db():
+    with mock_aws():
+        aws.client('dynamodb', settings.aws_region).create_table(
+            TableName=settings.dynamodb_table_name,
+            KeySchema=[{'AttributeName': 'id', 'KeyType': 'HASH'}],
+            AttributeDefinitions=[{'AttributeName': 'id', 'AttributeType': 'S'}],
+            BillingMode='PAY_PER_REQUEST'
+        )
+        yield DynamoDBClient()
+
+
+def test_get_product_by_id_returns_native_values(db):
+    created = db.create_product(dict(PRODUCT))
+
+    product = db.get_product_by_id(created['id'])
+
+    assert product == created
+    assert isinstance(product['in_stock'], int)
+    assert isinstance(product['price'], float)
+
+
+def test_get_product_by_id_missing(db):
+    assert db.get_product_by_id('missing') is None
+
+
+def test_get_products_page_follows_cursor(db):
+    created_ids = {db.create_product({**PRODUCT, 'sku': f'W-{i}'})['id'] for i in range(3)}
+
+    first = db.get_products_page(limit=2)
+    second = db.get_products_page(limit=2, start_key=first['next'])
+
+    assert len(first['items']) == 2
+    assert first['next'] is not None
+    seen = {item['id'] for item in first['items'] + second['items']}
+    assert seen == created_ids
+
+
+def test_get_all_products_reads_every_segment(db):
+    created_ids = {db.create_product({**PRODUCT, 'sku': f'W-{i}'})['id'] for i in range(12)}
+
+    products = db.get_all_products(limit=1000)
+
+    assert {product['id'] for product in products} == created_ids
+
+
+def test_get_all_products_respects_limit(db):
+    for i in range(12):
+        db.create_product({**PRODUCT, 'sku': f'W-{i}'})
+
+    # Small limits make each segment page several times to fill its share
+    assert len(db.get_all_products(limit=5)) == 5
+    assert len(db.get_all_products(limit=11)) == 11
+
+
+def test_update_product_returns_updated_item(db):
+    created = db.create_product(dict(PRODUCT))
+
+    updated = db.update_product(created['id'], {'price': 12.5, 'in_stock': 7})
+
+    assert updated['price'] == 12.5
+    assert updated['in_stock'] == 7
+    assert updated['name'] == PRODUCT['name']
+    assert db.get_product_by_id(created['id']) == updated
+
+
+def test_update_product_missing_returns_none(db):
+    assert db.update_product('missing', {'price': 1.0}) is None
+
+
+def test_get_products_by_ids_skips_missing_and_duplicates(db):
+    created = [db.create_product({**PRODUCT, 'sku': f'W-{i}'}) for i in range(3)]
+    ids = [product['id'] for product in created]
+
+    products = db.get_products_by_ids(ids + [ids[0], 'missing'])
+
+    assert products == {product['id']: product for product in created}
+
+
+def test_get_products_by_ids_retries_unprocessed_keys(db, monkeypatch):
+    created = db.create_product(dict(PRODUCT))
+    real_batch_get = db.dynamodb_client.batch_get_item
+    calls = []
+
+    def throttled_once(RequestItems):
+        calls.append(RequestItems)
+        if len(calls) == 1:
+            return {'Responses': {}, 'UnprocessedKeys': RequestItems}
+        return real_batch_get(RequestItems=RequestItems)
+
+    monkeypatch.setattr(db.dynamodb_client, 'batch_get_item', throttled_once)
+    monkeypatch.setattr('app.dynamodb_client.time.sleep', lambda _: None)
+
+    assert db.get_products_by_ids([created['id']]) == {created['id']: created}
+    assert len(calls) == 2
+
+
+def test_get_products_by_ids_gives_up_after_bounded_attempts(db, monkeypatch):
+    monkeypatch.setattr(
+        db.dynamodb_client, 'batch_get_item',
+        lambda RequestItems: {'Responses': {}, 'UnprocessedKeys': RequestItems}
+    )
+    monkeypatch.setattr('app.dynamodb_client.time.sleep', lambda _: None)
+
+    with pytest.raises(Exception):
+        db.get_products_by_ids(['a'])
+
+
+def test_bulk_create_products_shares_one_timestamp(db):
+    created = db.bulk_create_products([{**PRODUCT, 'sku': f'W-{i}'} for i in range(3)])
+
+    assert len({product['created_at'] for product in created}) == 1
+    assert db.get_products_by_ids([product['id'] for product in created]).keys() == {p['id'] for p in created}
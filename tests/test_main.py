@@ -0,0 +1,21 @@
+import asyncio
+import time
+
+from app import main
+from app.sqs import worker
+
+
+def test_startup_does_not_wait_on_slow_warm_up(monkeypatch):
+    async def no_worker(**kwargs):
+        return None
+
+    monkeypatch.setattr(main, '_warm_up_clients', lambda: time.sleep(1))
+    monkeypatch.setattr(main, 'WARM_UP_TIMEOUT', 0.05)
+    monkeypatch.setattr(worker, 'start_background_worker', no_worker)
+
+    async def timed_startup():
+        started = time.monotonic()
+        await main.startup()
+        return time.monotonic() - started
+
+    assert asyncio.run(timed_startup()) < 1
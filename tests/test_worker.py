@@ -0,0 +1,40 @@
+import asyncio
+import threading
+
+from app.sqs import worker
+
+
+class BlockingQueueService:
+    enabled = True
+
+    def __init__(self):
+        self.calls = 0
+        self.release = threading.Event()
+
+    def process_queued_notifications(self, batch_size):
+        self.calls += 1
+        self.release.wait(5)
+        return {"processed": 1, "successful": 1}
+
+
+def test_timed_out_batch_is_awaited_before_the_next_one(monkeypatch):
+    service = BlockingQueueService()
+    monkeypatch.setattr(worker, 'NotificationQueueService', lambda: service)
+    monkeypatch.setattr(worker, 'BATCH_TIMEOUT', 0.05)
+
+    async def run():
+        notification_worker = worker.NotificationWorker()
+
+        # Both polls time out while the first batch is still running in its thread
+        await notification_worker._process_batch()
+        await notification_worker._process_batch()
+        assert service.calls == 1
+
+        service.release.set()
+        await notification_worker._process_batch()
+        assert notification_worker.stats["total_successful"] == 1
+
+        await notification_worker._process_batch()
+        assert service.calls == 2
+
+    asyncio.run(run())